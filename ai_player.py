@@ -5,16 +5,175 @@ This module implements a simple heuristic-based AI player for Stone Age.
 The AI uses a greedy evaluation function to choose actions.
 """
 
+from collections import OrderedDict
+import heapq
 from typing import List, Tuple, Optional
 import random
-from game_state import GameState, Player, ActionSpace, ResourceType, Building, CivilizationCard
+from game_state import (GameState, Player, Board, ActionSpace, ResourceType, Building,
+                        CivilizationCard, RESOURCE_INDEX)
+
+
+# Maximum number of game-state signatures kept in the utility cache
+UTILITY_CACHE_SIZE = 4096
+
+# Worker counts drawn at a time; a game only uses a few dozen, so the table is refilled lazily
+WORKER_COUNT_BATCH = 64
+
+# Action spaces in utility-array order (also the tie-break order when sorting)
+UTILITY_ACTIONS = (
+    ActionSpace.HUNTING_GROUNDS,
+    ActionSpace.FOREST,
+    ActionSpace.CLAY_PIT,
+    ActionSpace.QUARRY,
+    ActionSpace.RIVER,
+    ActionSpace.FARM,
+    ActionSpace.TOOL_MAKER,
+    ActionSpace.HUT,
+    ActionSpace.CIVILIZATION_CARD,
+    ActionSpace.BUILDING,
+)
+
+# Action spaces that take several workers at once
+MULTI_WORKER_SPACES = frozenset([
+    ActionSpace.FOREST, ActionSpace.CLAY_PIT, ActionSpace.QUARRY,
+    ActionSpace.RIVER, ActionSpace.HUNTING_GROUNDS,
+])
+
+# Action spaces that take exactly one worker
+SINGLE_WORKER_SPACES = frozenset([
+    ActionSpace.FARM, ActionSpace.TOOL_MAKER,
+    ActionSpace.CIVILIZATION_CARD, ActionSpace.BUILDING,
+])
+
+
+# Resource gathered on each gathering space
+GATHERING_RESOURCES = {
+    ActionSpace.HUNTING_GROUNDS: ResourceType.FOOD,
+    ActionSpace.FOREST: ResourceType.WOOD,
+    ActionSpace.CLAY_PIT: ResourceType.BRICK,
+    ActionSpace.QUARRY: ResourceType.STONE,
+    ActionSpace.RIVER: ResourceType.GOLD,
+}
+
+# Die size on each gathering space (total roll divided by this gives the resources)
+GATHERING_DICE_SIDES = {
+    ActionSpace.HUNTING_GROUNDS: 2,
+    ActionSpace.FOREST: 3,
+    ActionSpace.CLAY_PIT: 4,
+    ActionSpace.QUARRY: 5,
+    ActionSpace.RIVER: 6,
+}
+
+# Hunting grounds utility by food situation: short, below 1.5x workers, comfortable
+HUNTING_UTILITY = (100.0, 50.0, 20.0)
+
+# Gathering utility: base + per building needing the resource + per-resource bonus
+GATHERING_BASE_UTILITY = 30.0
+GATHERING_DEMAND_UTILITY = 20.0
+
+# Extra utility per resource (indexed by RESOURCE_INDEX): gold and stone are more valuable
+GATHERING_BONUS = (0.0, 0.0, 10.0, 15.0, 0.0)
+
+# Farm utility (late game, before round 5)
+FARM_UTILITY = (30.0, 80.0)
+
+# Tool maker utility by number of tools owned (capped at 3)
+TOOL_MAKER_UTILITY = (70.0, 70.0, 40.0, 20.0)
+
+# Hut utility by 2 * (early game with room to grow) + (food track >= 2)
+HUT_UTILITY = (10.0, 10.0, 40.0, 85.0)
+
+# Civilization card utility (deck empty, cards left)
+CIVILIZATION_CARD_UTILITY = (0.0, 60.0)
+
+# Building utility: base plus the building's points if affordable, else a flat value
+BUILDING_UTILITY = 90.0
+BUILDING_UNAFFORDABLE_UTILITY = 25.0
+
+
+def gather_resource(worker_count: int, dice_sides: int, best_tool: int,
+                    rng: random.Random) -> int:
+    """
+    Roll one die per worker, add the best tool and convert the total to resources.
+    Takes plain integers and the caller's RNG so it stays independent of the game objects.
+    """
+    total = sum(rng.choices(range(1, dice_sides + 1), k=worker_count)) + best_tool
+    return max(1, total // dice_sides)  # At least 1 resource
+
+
+def _build_utilities_fn():
+    """
+    Generate the utility function with every rule constant inlined as a literal.
+    The result is one straight-line function over plain numbers that returns
+    utilities in UTILITY_ACTIONS order, with no enum, dict or method lookups.
+    """
+    terms = []
+    for action in UTILITY_ACTIONS:
+        if action is ActionSpace.HUNTING_GROUNDS:
+            # Short of food / below 1.5x the workers / comfortable
+            terms.append(f"{HUNTING_UTILITY!r}[(available_food >= workers)"
+                         f" + (2 * available_food >= 3 * workers)]")
+        elif action in GATHERING_RESOURCES:
+            idx = RESOURCE_INDEX[GATHERING_RESOURCES[action]]
+            base = GATHERING_BASE_UTILITY + GATHERING_BONUS[idx]
+            terms.append(f"{base!r} + {GATHERING_DEMAND_UTILITY!r} * demand[{idx}]")
+        elif action is ActionSpace.FARM:
+            # Good investment early game, less valuable later
+            terms.append(f"{FARM_UTILITY!r}[current_round < 5]")
+        elif action is ActionSpace.TOOL_MAKER:
+            # Good if we don't have many tools
+            terms.append(f"{TOOL_MAKER_UTILITY!r}[min(n_tools, 3)]")
+        elif action is ActionSpace.HUT:
+            # Good investment early game if we have food production
+            terms.append(f"{HUT_UTILITY!r}[2 * ((current_round < 4) & (workers < 8))"
+                         f" + (food_track >= 2)]")
+        elif action is ActionSpace.CIVILIZATION_CARD:
+            terms.append(f"{CIVILIZATION_CARD_UTILITY!r}[n_civ_cards > 0]")
+        elif action is ActionSpace.BUILDING:
+            # Higher utility for more valuable buildings, lower if we can't afford yet
+            terms.append(f"({BUILDING_UTILITY!r} + building_points if building_points >= 0"
+                         f" else {BUILDING_UNAFFORDABLE_UTILITY!r})")
+    
+    src = (
+        "def compute_utilities(food, workers, food_track, n_tools, current_round,\n"
+        "                      demand, building_points, n_civ_cards):\n"
+        "    available_food = food + food_track\n"
+        "    return (\n"
+        + "".join(f"        {term},\n" for term in terms)
+        + "    )\n"
+    )
+    namespace = {}
+    exec(compile(src, "<ai utility rules>", "exec"), namespace)
+    return namespace["compute_utilities"]
+
+
+# compute_utilities(food, workers, food_track, n_tools, current_round, demand,
+#                   building_points, n_civ_cards) -> utilities in UTILITY_ACTIONS order.
+# building_points is the first affordable building's points, or -1.
+compute_utilities = _build_utilities_fn()
 
 
 class AIPlayer:
     """Simple heuristic-based AI player"""
     
-    def __init__(self, player_index: int):
+    __slots__ = ("player_index", "_utilities_cache", "_actions", "_demand",
+                 "_rand_counts", "_rc_idx", "_aff_cache", "_rng")
+    
+    def __init__(self, player_index: int, seed: Optional[int] = None):
         self.player_index = player_index
+        # Private RNG so other users of the random module don't perturb this player
+        self._rng = random.Random(None if seed is None else seed ^ player_index)
+        self._utilities_cache = OrderedDict()  # State signature -> utilities (LRU order)
+        self._actions = UTILITY_ACTIONS
+        self._demand = [0] * len(ResourceType)  # Buildings needing each resource
+        
+        # Pre-drawn 2-4 worker counts for resource spaces, consumed through a cursor
+        # and drawn on first use
+        self._rand_counts = b""
+        self._rc_idx = 0
+        
+        # (round, resources version, buildings version), resources, board, best affordable index, first affordable points
+        self._aff_cache = None
     
     def decide_worker_placement(self, game_state: GameState) -> List[Tuple[ActionSpace, int]]:
         """
@@ -22,153 +181,100 @@ class AIPlayer:
         Returns a list of (ActionSpace, worker_count) tuples.
         """
         player = game_state.players[self.player_index]
+        board = game_state.board
         available_workers = player.workers
         placements = []
         
         # Calculate utilities for each action space
-        action_utilities = self._calculate_action_utilities(game_state)
+        utilities = self._calculate_action_utilities(player, board, game_state.current_round)
         
-        # Sort actions by utility (highest first)
-        sorted_actions = sorted(action_utilities.items(), key=lambda x: x[1], reverse=True)
+        # Heap of (-utility, index): pops highest utility first, ties in index order.
+        # Only as many actions as needed to use up the workers are ever popped.
+        heap = [(-utility, idx) for idx, utility in enumerate(utilities)]
+        heapq.heapify(heap)
         
         # Greedily place workers on highest utility actions
-        for action, utility in sorted_actions:
-            if available_workers <= 0:
-                break
+        while heap and available_workers > 0:
+            _, idx = heapq.heappop(heap)
+            action = self._actions[idx]
             
             # Determine how many workers to place
             workers_to_place = self._decide_worker_count(game_state, action, available_workers)
             
-            if workers_to_place > 0 and game_state.board.can_place_workers(action, workers_to_place):
+            if workers_to_place > 0 and board.can_place_workers(action, workers_to_place):
                 placements.append((action, workers_to_place))
                 available_workers -= workers_to_place
         
         return placements
     
-    def _calculate_action_utilities(self, game_state: GameState) -> dict:
-        """Calculate utility scores for each action space"""
-        player = game_state.players[self.player_index]
-        utilities = {}
-        
-        # Resource gathering utilities
-        utilities[ActionSpace.HUNTING_GROUNDS] = self._evaluate_hunting_grounds(game_state)
-        utilities[ActionSpace.FOREST] = self._evaluate_resource_gathering(game_state, ResourceType.WOOD)
-        utilities[ActionSpace.CLAY_PIT] = self._evaluate_resource_gathering(game_state, ResourceType.BRICK)
-        utilities[ActionSpace.QUARRY] = self._evaluate_resource_gathering(game_state, ResourceType.STONE)
-        utilities[ActionSpace.RIVER] = self._evaluate_resource_gathering(game_state, ResourceType.GOLD)
-        
-        # Special action utilities
-        utilities[ActionSpace.FARM] = self._evaluate_farm(game_state)
-        utilities[ActionSpace.TOOL_MAKER] = self._evaluate_tool_maker(game_state)
-        utilities[ActionSpace.HUT] = self._evaluate_hut(game_state)
-        utilities[ActionSpace.CIVILIZATION_CARD] = self._evaluate_civilization_card(game_state)
-        utilities[ActionSpace.BUILDING] = self._evaluate_building(game_state)
-        
-        return utilities
-    
-    def _evaluate_hunting_grounds(self, game_state: GameState) -> float:
-        """Evaluate hunting grounds (food gathering)"""
-        player = game_state.players[self.player_index]
-        
-        # High priority if we need food to feed workers
-        food_needed = player.workers
-        current_food = player.resources.food + player.food_track
-        
-        if current_food < food_needed:
-            return 100.0  # Critical priority
-        elif current_food < food_needed * 1.5:
-            return 50.0  # High priority
-        else:
-            return 20.0  # Low priority
+    def _state_signature(self, player: Player, board: Board, current_round: int) -> tuple:
+        """Build a hashable signature of everything the utility functions read"""
+        return (
+            self.player_index,
+            current_round,
+            player.workers,
+            player.food_track,
+            bytes(player.tools),
+            player.resources.as_tuple(),
+            tuple((b.name, b.points) for b in board.buildings),
+            len(board.civilization_cards),
+        )
     
-    def _evaluate_resource_gathering(self, game_state: GameState, resource_type: ResourceType) -> float:
-        """Evaluate resource gathering spaces"""
-        player = game_state.players[self.player_index]
-        
-        # Check if we need this resource for buildings
-        utility = 30.0  # Base utility
-        
-        for building in game_state.board.buildings:
-            if resource_type in building.cost:
-                # Higher utility if we need this resource
-                utility += 20.0
-        
-        # Bonus for gold and stone (more valuable)
-        if resource_type == ResourceType.GOLD:
-            utility += 15.0
-        elif resource_type == ResourceType.STONE:
-            utility += 10.0
-        
-        return utility
-    
-    def _evaluate_farm(self, game_state: GameState) -> float:
-        """Evaluate farm (increase food production)"""
-        player = game_state.players[self.player_index]
-        
-        # Good investment early game, less valuable later
-        if game_state.current_round < 5:
-            return 80.0
-        else:
-            return 30.0
-    
-    def _evaluate_tool_maker(self, game_state: GameState) -> float:
-        """Evaluate tool maker"""
-        player = game_state.players[self.player_index]
-        
-        # Good if we don't have many tools
-        if len(player.tools) < 2:
-            return 70.0
-        elif len(player.tools) < 3:
-            return 40.0
-        else:
-            return 20.0
-    
-    def _evaluate_hut(self, game_state: GameState) -> float:
-        """Evaluate hut (get more workers)"""
-        player = game_state.players[self.player_index]
-        
-        # Good investment early game if we have food production
-        if game_state.current_round < 4 and player.workers < 8:
-            if player.food_track >= 2:
-                return 85.0
-            else:
-                return 40.0
-        else:
-            return 10.0
+    def _calculate_action_utilities(self, player: Player, board: Board,
+                                    current_round: int) -> Tuple[float, ...]:
+        """
+        Calculate utility scores for each action space (memoized by state signature).
+        Returns utilities indexed like UTILITY_ACTIONS.
+        """
+        signature = self._state_signature(player, board, current_round)
+        cache = self._utilities_cache
+        
+        utilities = cache.get(signature)
+        if utilities is not None:
+            cache.move_to_end(signature)
+            return utilities
+        
+        utilities = self._compute_action_utilities(player, board, current_round)
+        cache[signature] = utilities
+        if len(cache) > UTILITY_CACHE_SIZE:
+            cache.popitem(last=False)  # Evict least recently used
+        return utilities
     
-    def _evaluate_civilization_card(self, game_state: GameState) -> float:
-        """Evaluate taking a civilization card"""
-        if game_state.board.civilization_cards:
-            # Civilization cards give good points
-            return 60.0
-        return 0.0
+    def _compute_action_utilities(self, player: Player, board: Board,
+                                  current_round: int) -> Tuple[float, ...]:
+        """Compute utility scores from scratch, in UTILITY_ACTIONS order"""
+        self._refresh_demand(board)
+        _, building_points = self._building_affordability(player, board, current_round)
+        
+        return compute_utilities(
+            player.resources.food, player.workers, player.food_track, player.tool_count(),
+            current_round, self._demand, building_points, len(board.civilization_cards),
+        )
     
-    def _evaluate_building(self, game_state: GameState) -> float:
-        """Evaluate building a building"""
-        player = game_state.players[self.player_index]
-        
-        # Check if we can afford any building
-        for building in game_state.board.buildings:
-            if player.resources.can_afford(building.cost):
-                # Higher utility for more valuable buildings
-                return 90.0 + building.points
-        
-        # Lower utility if we can't afford yet
-        return 25.0
+    def _refresh_demand(self, board: Board):
+        """Count, in one pass, how many available buildings need each resource"""
+        demand = self._demand
+        for i in range(len(demand)):
+            demand[i] = 0
+        for building in board.buildings:
+            for resource_type in building.cost:
+                demand[RESOURCE_INDEX[resource_type]] += 1
     
     def _decide_worker_count(self, game_state: GameState, action: ActionSpace, 
                             available_workers: int) -> int:
         """Decide how many workers to place on an action"""
         # Resource gathering: place multiple workers
-        if action in [ActionSpace.FOREST, ActionSpace.CLAY_PIT, ActionSpace.QUARRY, 
-                     ActionSpace.RIVER, ActionSpace.HUNTING_GROUNDS]:
-            # Place 2-4 workers on resource spaces
-            count = min(random.randint(2, 4), available_workers)
-            return count
+        if action in MULTI_WORKER_SPACES:
+            # Place 2-4 workers on resource spaces, drawing the next batch when the table runs out
+            if self._rc_idx == len(self._rand_counts):
+                self._rand_counts = bytes(self._rng.choices((2, 3, 4), k=WORKER_COUNT_BATCH))
+                self._rc_idx = 0
+            count = self._rand_counts[self._rc_idx]
+            self._rc_idx += 1
+            return min(count, available_workers)
         
         # Single worker spaces
-        elif action in [ActionSpace.FARM, ActionSpace.TOOL_MAKER, 
-                       ActionSpace.CIVILIZATION_CARD, ActionSpace.BUILDING]:
+        elif action in SINGLE_WORKER_SPACES:
             return 1
         
         # Hut can take up to 2 workers
@@ -186,30 +292,11 @@ class AIPlayer:
         player = game_state.players[self.player_index]
         log = f"{player.name} resolves {action.value} with {worker_count} worker(s): "
         
-        if action == ActionSpace.HUNTING_GROUNDS:
-            food = self._gather_resource(worker_count, 2, player)
-            player.resources.add(ResourceType.FOOD, food)
-            log += f"collected {food} food"
-        
-        elif action == ActionSpace.FOREST:
-            wood = self._gather_resource(worker_count, 3, player)
-            player.resources.add(ResourceType.WOOD, wood)
-            log += f"collected {wood} wood"
-        
-        elif action == ActionSpace.CLAY_PIT:
-            brick = self._gather_resource(worker_count, 4, player)
-            player.resources.add(ResourceType.BRICK, brick)
-            log += f"collected {brick} brick"
-        
-        elif action == ActionSpace.QUARRY:
-            stone = self._gather_resource(worker_count, 5, player)
-            player.resources.add(ResourceType.STONE, stone)
-            log += f"collected {stone} stone"
-        
-        elif action == ActionSpace.RIVER:
-            gold = self._gather_resource(worker_count, 6, player)
-            player.resources.add(ResourceType.GOLD, gold)
-            log += f"collected {gold} gold"
+        resource_type = GATHERING_RESOURCES.get(action)
+        if resource_type is not None:
+            amount = self._gather_resource(worker_count, GATHERING_DICE_SIDES[action], player)
+            player.resources.add(resource_type, amount)
+            log += f"collected {amount} {resource_type.value.lower()}"
         
         elif action == ActionSpace.FARM:
             player.food_track += 1
@@ -217,7 +304,7 @@ class AIPlayer:
         
         elif action == ActionSpace.TOOL_MAKER:
             player.add_tool()
-            log += f"gained a tool (tools: {player.tools})"
+            log += f"gained a tool (tools: {player.owned_tools()})"
         
         elif action == ActionSpace.HUT:
             for _ in range(worker_count):
@@ -227,16 +314,16 @@ class AIPlayer:
         elif action == ActionSpace.CIVILIZATION_CARD:
             card = game_state.board.get_available_civilization_card()
             if card:
-                player.civilization_cards.append(card)
+                player.add_civilization_card(card)
                 log += f"took {card}"
             else:
                 log += "no cards available"
         
         elif action == ActionSpace.BUILDING:
-            building = self._choose_building(game_state)
+            building = self._choose_building(player, game_state.board, game_state.current_round)
             if building:
-                player.resources.spend(building.cost)
-                player.buildings.append(building)
+                player.resources.spend(building.cost_vector)
+                player.add_building(building)
                 log += f"built {building}"
             else:
                 log += "couldn't afford any building"
@@ -246,42 +333,43 @@ class AIPlayer:
     def _gather_resource(self, worker_count: int, dice_sides: int, player: Player) -> int:
         """
         Simulate resource gathering with dice rolls.
-        Each worker rolls a die, and we can use tools to improve results.
+        Each worker rolls a die, and the best tool improves the result.
         """
-        total = 0
-        
-        # Roll dice for each worker
-        for _ in range(worker_count):
-            roll = random.randint(1, dice_sides)
-            total += roll
-        
-        # Optionally use tools to improve results
-        if player.tools:
-            # Use the best tool available
-            tool_bonus = max(player.tools)
-            total += tool_bonus
-        
-        # Divide by dice sides to get resource count
-        resources = total // dice_sides
-        return max(1, resources)  # At least 1 resource
+        best_tool = max(player.tools)  # Empty slots hold 0
+        return gather_resource(worker_count, dice_sides, best_tool, self._rng)
+    
+    def _building_affordability(self, player: Player, board: Board,
+                                current_round: int) -> Tuple[int, int]:
+        """
+        Get (index of the most valuable affordable building, points of the first
+        affordable building), each -1 if nothing is affordable. The result is cached
+        until the round, the player's resources or the available buildings change.
+        """
+        resources = player.resources
+        key = (current_round, resources._version, board.buildings_version)
+        cached = self._aff_cache
+        if (cached is not None and cached[0] == key
+                and cached[1] is resources and cached[2] is board):  # Clones share version numbers
+            return cached[3], cached[4]
+        
+        # Score every building in one pass: its points if affordable, else -1
+        costs, points = board.building_table()
+        can_afford = resources.can_afford
+        scores = [pts if can_afford(cost) else -1 for cost, pts in zip(costs, points)]
+        
+        # Most valuable affordable building (first one on ties)
+        best_index = max(range(len(scores)), key=scores.__getitem__, default=-1)
+        if best_index >= 0 and scores[best_index] < 0:
+            best_index = -1
+        first_points = next((pts for pts in scores if pts >= 0), -1)
+        
+        self._aff_cache = (key, resources, board, best_index, first_points)
+        return best_index, first_points
     
-    def _choose_building(self, game_state: GameState) -> Optional[Building]:
+    def _choose_building(self, player: Player, board: Board, current_round: int) -> Optional[Building]:
         """Choose which building to build (if affordable)"""
-        player = game_state.players[self.player_index]
-        
-        # Find the most valuable affordable building
-        best_building = None
-        best_index = -1
-        best_points = 0
-        
-        for i, building in enumerate(game_state.board.buildings):
-            if player.resources.can_afford(building.cost):
-                if building.points > best_points:
-                    best_building = building
-                    best_index = i
-                    best_points = building.points
-        
-        if best_building:
-            return game_state.board.get_available_building(best_index)
+        best_index, _ = self._building_affordability(player, board, current_round)
+        if best_index < 0:
+            return None
         
-        return None
+        return board.get_available_building(best_index)
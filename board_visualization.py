@@ -5,8 +5,9 @@ This module provides ASCII-based visualization of the Stone Age game board,
 including the scoring track, action spaces, and game components.
 """
 
-from game_state import GameState, ActionSpace, Player, ResourceType
-from typing import List
+import sys
+from game_state import GameState, ActionSpace, Player, ResourceType, FACE_UP_SLOTS
+from typing import List, Optional
 
 
 # Resource type abbreviations for display
@@ -18,41 +19,95 @@ RESOURCE_ABBREV = {
     ResourceType.FOOD: "F",
 }
 
+# Player status resource line. Icons are filled in once per visualizer; the
+# remaining positional fields follow Resources.as_tuple() order.
+RESOURCE_STATUS_LINE = ("  Resources: Wood={{0}}{wood} Brick={{1}}{brick} Stone={{2}}{stone} "
+                        "Gold={{3}}{gold} Food={{4}}{food}")
+
 
 class BoardVisualizer:
     """Handles visualization of the Stone Age game board"""
     
-    def __init__(self, game_state: GameState):
+    __slots__ = ("game_state", "board_width", "board_height", "_icons",
+                 "_separator", "_points_top", "_zone_templates", "_special_zone_templates",
+                 "_resource_line")
+    
+    # Icons for terminals, and plain-ASCII tags for piped or logged output
+    # (all four characters wide, so the padded columns after them line up)
+    _ICONS_UNICODE = {
+        "food": "🍖", "wood": "🌲", "brick": "🧱", "stone": "🪨", "gold": "💰",
+        "farm": "🌾", "tool": "🔨", "hut": "🏠", "card": "📜", "building": "🏛️ ",
+    }
+    _ICONS_ASCII = {
+        "food": "[F ]", "wood": "[W ]", "brick": "[B ]", "stone": "[S ]", "gold": "[G ]",
+        "farm": "[Fm]", "tool": "[T ]", "hut": "[H ]", "card": "[C ]", "building": "[Bd]",
+    }
+    
+    def __init__(self, game_state: GameState, unicode_icons: Optional[bool] = None):
+        """unicode_icons defaults to whether stdout is a terminal"""
         self.game_state = game_state
         self.board_width = 120
         self.board_height = 40
+        
+        if unicode_icons is None:
+            unicode_icons = sys.stdout.isatty()
+        self._icons = icons = self._ICONS_UNICODE if unicode_icons else self._ICONS_ASCII
+        
+        # Static text, formatted once; renders only fill in the worker counts
+        self._separator = "─" * 50
+        self._points_top = "".join([f"{i:2d} " if i % 5 == 0 else " . " for i in range(25)])
+        self._zone_templates = [
+            (action, max_workers, f"{icons[icon]} {name:25s} ")
+            for name, action, icon, max_workers in (
+                ("Hunting Grounds (Food)", ActionSpace.HUNTING_GROUNDS, "food", 7),
+                ("Forest (Wood)", ActionSpace.FOREST, "wood", 7),
+                ("Clay Pit (Brick)", ActionSpace.CLAY_PIT, "brick", 7),
+                ("Quarry (Stone)", ActionSpace.QUARRY, "stone", 7),
+                ("River (Gold)", ActionSpace.RIVER, "gold", 7),
+            )
+        ]
+        self._special_zone_templates = [
+            (action, max_workers, f"{icons[icon]} {name:30s} ")
+            for name, action, icon, max_workers in (
+                ("Farm (Food Production)", ActionSpace.FARM, "farm", 1),
+                ("Tool Maker", ActionSpace.TOOL_MAKER, "tool", 1),
+                ("Hut (Get Workers)", ActionSpace.HUT, "hut", 2),
+            )
+        ]
+        self._resource_line = RESOURCE_STATUS_LINE.format_map(icons)
     
     def display_full_board(self):
         """Display the complete game board with all components"""
-        print("\n" + "=" * self.board_width)
-        print("STONE AGE - GAME BOARD".center(self.board_width))
-        print("=" * self.board_width)
+        all_lines = [
+            "\n" + "=" * self.board_width,
+            "STONE AGE - GAME BOARD".center(self.board_width),
+            "=" * self.board_width,
+        ]
         
         # Display scoring track
-        self._display_scoring_track()
+        all_lines += self._display_scoring_track()
         
         # Display game board interior
-        self._display_board_interior()
+        all_lines += self._display_board_interior()
         
         # Display bottom of scoring track
-        self._display_scoring_track_bottom()
+        all_lines += self._display_scoring_track_bottom()
         
-        print("=" * self.board_width)
+        all_lines.append("=" * self.board_width)
+        
+        # Emit the whole board in a single write
+        sys.stdout.write("\n".join(all_lines) + "\n")
     
-    def _display_scoring_track(self):
-        """Display the top portion of the scoring track (points 0-29)"""
+    def _display_scoring_track(self) -> List[str]:
+        """Return the lines of the top portion of the scoring track (points 0-29)"""
         # Top edge with points 0-24
-        points_top = "".join([f"{i:2d} " if i % 5 == 0 else " . " for i in range(25)])
-        print("┌" + "─" * (self.board_width - 2) + "┐")
-        print(f"│ Points: {points_top.ljust(self.board_width - 12)}│")
+        return [
+            "┌" + "─" * (self.board_width - 2) + "┐",
+            f"│ Points: {self._points_top.ljust(self.board_width - 12)}│",
+        ]
     
-    def _display_board_interior(self):
-        """Display the interior of the board with action spaces and game components"""
+    def _display_board_interior(self) -> List[str]:
+        """Return the lines of the board interior with action spaces and game components"""
         # Left side scoring track points (25-49)
         left_start = 25
         right_start = 75
@@ -68,75 +123,59 @@ class BoardVisualizer:
         # (removed to save space)
         
         # Lines: Resource zones
-        resource_zones = [
-            ("Hunting Grounds (Food)", ActionSpace.HUNTING_GROUNDS, "🍖", 7),
-            ("Forest (Wood)", ActionSpace.FOREST, "🌲", 7),
-            ("Clay Pit (Brick)", ActionSpace.CLAY_PIT, "🧱", 7),
-            ("Quarry (Stone)", ActionSpace.QUARRY, "🪨", 7),
-            ("River (Gold)", ActionSpace.RIVER, "💰", 7),
-        ]
-        
-        for name, action, icon, max_workers in resource_zones:
-            workers_here = len(self.game_state.board.placed_workers.get(action, []))
-            worker_display = f"[{workers_here}/{max_workers} workers]"
-            text = f"{icon} {name:25s} {worker_display}"
-            lines.append((text, False))
+        for action, max_workers, template in self._zone_templates:
+            workers_here = self.game_state.board.placed_worker_counts.get(action, 0)
+            lines.append((f"{template}[{workers_here}/{max_workers} workers]", False))
         
         # Separator
-        lines.append(("─" * 50, False))
+        lines.append((self._separator, False))
         
         # Special action zones
         lines.append(("SPECIAL ACTION ZONES", False))
         
-        special_zones = [
-            ("Farm (Food Production)", ActionSpace.FARM, "🌾", 1),
-            ("Tool Maker", ActionSpace.TOOL_MAKER, "🔨", 1),
-            ("Hut (Get Workers)", ActionSpace.HUT, "🏠", 2),
-        ]
-        
-        for name, action, icon, max_workers in special_zones:
-            workers_here = len(self.game_state.board.placed_workers.get(action, []))
-            worker_display = f"[{workers_here}/{max_workers} workers]"
-            text = f"{icon} {name:30s} {worker_display}"
-            lines.append((text, False))
+        for action, max_workers, template in self._special_zone_templates:
+            workers_here = self.game_state.board.placed_worker_counts.get(action, 0)
+            lines.append((f"{template}[{workers_here}/{max_workers} workers]", False))
         
         # Separator
-        lines.append(("─" * 50, False))
+        lines.append((self._separator, False))
         
         # Civilization cards
-        workers_here = len(self.game_state.board.placed_workers.get(ActionSpace.CIVILIZATION_CARD, []))
+        workers_here = self.game_state.board.placed_worker_counts.get(ActionSpace.CIVILIZATION_CARD, 0)
         lines.append((f"CIVILIZATION CARDS [{workers_here}/1 workers]", False))
         
         # Display 4 civilization cards
-        cards = self.game_state.board.civilization_cards[:4]
-        for i in range(4):
-            if i < len(cards):
-                card = cards[i]
-                text = f"  📜 {i+1}. {card.name:20s} ({card.points:2d} pts)"
+        cards = self.game_state.board.face_up_cards
+        for i in range(FACE_UP_SLOTS):
+            card = cards[i]
+            if card is not None:
+                text = f"  {self._icons['card']} {i+1}. {card.name:20s} ({card.points:2d} pts)"
             else:
                 text = f"     {i+1}. [No card available]"
             lines.append((text, False))
         
         # Separator
-        lines.append(("─" * 50, False))
+        lines.append((self._separator, False))
         
         # Buildings
-        workers_here = len(self.game_state.board.placed_workers.get(ActionSpace.BUILDING, []))
+        workers_here = self.game_state.board.placed_worker_counts.get(ActionSpace.BUILDING, 0)
         lines.append((f"BUILDINGS [{workers_here}/1 workers]", False))
         
         # Display 4 buildings
-        buildings = self.game_state.board.buildings[:4]
-        for i in range(4):
-            if i < len(buildings):
-                building = buildings[i]
+        buildings = self.game_state.board.face_up_buildings
+        for i in range(FACE_UP_SLOTS):
+            building = buildings[i]
+            if building is not None:
                 cost_str = ", ".join([f"{amt}{RESOURCE_ABBREV[res]}" for res, amt in building.cost.items()])
-                text = f"  🏛️  {i+1}. {building.name:15s} Cost:[{cost_str:12s}] ({building.points:2d} pts)"
+                text = (f"  {self._icons['building']} {i+1}. {building.name:15s} "
+                        f"Cost:[{cost_str:12s}] ({building.points:2d} pts)")
             else:
                 text = f"     {i+1}. [No building available]"
             lines.append((text, False))
         
         # Only show separator and buildings if we have room
-        # Print all lines with left and right point numbers
+        # Frame all lines with left and right point numbers
+        output = []
         for i, (text, _) in enumerate(lines):
             if i >= max_lines:
                 break
@@ -147,7 +186,7 @@ class BoardVisualizer:
             # Pad to width (ensure non-negative padding)
             padding = max(0, self.board_width - 8 - len(line))
             line += " " * padding + f" │{right_point:2d}│"
-            print(line)
+            output.append(line)
         
         # Fill remaining space if needed
         current_line = len(lines)
@@ -157,50 +196,59 @@ class BoardVisualizer:
             line = f"│{left_point:2d}│"
             padding = max(0, self.board_width - 8 - len(line))
             line += " " * padding + f" │{right_point:2d}│"
-            print(line)
+            output.append(line)
             current_line += 1
+        
+        return output
     
-    def _display_scoring_track_bottom(self):
-        """Display the bottom portion of the scoring track (points 50-99)"""
+    def _display_scoring_track_bottom(self) -> List[str]:
+        """Return the lines of the bottom portion of the scoring track (points 50-99)"""
         # Bottom edge with points 50-74
         points_bottom = "".join([f"{i:2d} " if i % 5 == 0 else " . " for i in range(50, 75)])
-        print(f"│        {points_bottom.ljust(self.board_width - 12)}│")
-        print("└" + "─" * (self.board_width - 2) + "┘")
         
         # Display remaining points 75-99 (right side shown in interior)
         remaining = "Points 75-99 on right edge ↑"
-        print(f"  {remaining}")
+        return [
+            f"│        {points_bottom.ljust(self.board_width - 12)}│",
+            "└" + "─" * (self.board_width - 2) + "┘",
+            f"  {remaining}",
+        ]
     
     def display_player_status(self):
         """Display current status of all players"""
-        print("\n" + "=" * self.board_width)
-        print("PLAYER STATUS".center(self.board_width))
-        print("=" * self.board_width)
+        lines = [
+            "\n" + "=" * self.board_width,
+            "PLAYER STATUS".center(self.board_width),
+            "=" * self.board_width,
+        ]
         
         for i, player in enumerate(self.game_state.players):
-            print(f"\n{player.name}:")
-            print(f"  Score: {player.score} pts")
-            print(f"  Workers: {player.workers}")
-            print(f"  Food/Turn: {player.food_track} 🌾")
-            print(f"  Tools: {player.tools if player.tools else 'None'}")
-            print(f"  Resources: Wood={player.resources.wood}🌲 Brick={player.resources.brick}🧱 "
-                  f"Stone={player.resources.stone}🪨 Gold={player.resources.gold}💰 Food={player.resources.food}🍖")
-            print(f"  Civilization Cards: {len(player.civilization_cards)}")
+            lines.append(f"\n{player.name}:")
+            lines.append(f"  Score: {player.score} pts")
+            lines.append(f"  Workers: {player.workers}")
+            lines.append(f"  Food/Turn: {player.food_track} {self._icons['farm']}")
+            tools = player.owned_tools()
+            lines.append(f"  Tools: {tools if tools else 'None'}")
+            lines.append(self._resource_line.format(*player.resources.as_tuple()))
+            lines.append(f"  Civilization Cards: {len(player.civilization_cards)}")
             if player.civilization_cards:
                 for card in player.civilization_cards:
-                    print(f"    - {card}")
-            print(f"  Buildings: {len(player.buildings)}")
+                    lines.append(f"    - {card}")
+            lines.append(f"  Buildings: {len(player.buildings)}")
             if player.buildings:
                 for building in player.buildings:
-                    print(f"    - {building}")
+                    lines.append(f"    - {building}")
         
-        print("\n" + "=" * self.board_width)
+        lines.append("\n" + "=" * self.board_width)
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def display_round_header(self, round_num: int):
         """Display round header"""
-        print("\n" + "█" * self.board_width)
-        print(f"ROUND {round_num}".center(self.board_width))
-        print("█" * self.board_width)
+        sys.stdout.write("\n".join([
+            "\n" + "█" * self.board_width,
+            f"ROUND {round_num}".center(self.board_width),
+            "█" * self.board_width,
+        ]) + "\n")
 
 
 def display_game_board(game_state: GameState):
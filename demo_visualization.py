@@ -24,7 +24,7 @@ print("  • Player status with resources, tools, and food production")
 print("\n" + "=" * 120)
 
 # Create game with visualization
-engine = GameEngine(num_players=2, enable_visualization=True)
+engine = GameEngine(num_players=2, enable_visualization=True, seed=42)
 engine.game_state.current_round = 5
 
 # Simulate active game state with workers placed
@@ -44,7 +44,7 @@ p1.resources.stone = 3
 p1.resources.gold = 2
 p1.resources.food = 5
 p1.food_track = 3
-p1.tools = [1, 2, 2]
+p1.tools = bytearray([1, 2, 2])
 p1.score = 52
 p1.workers = 8
 
@@ -52,7 +52,7 @@ p1.workers = 8
 if engine.game_state.board.civilization_cards:
     card = engine.game_state.board.get_available_civilization_card()
     if card:
-        p1.civilization_cards.append(card)
+        p1.add_civilization_card(card)
 
 p2 = engine.game_state.players[1]
 p2.resources.wood = 3
@@ -61,13 +61,13 @@ p2.resources.stone = 1
 p2.resources.gold = 4
 p2.resources.food = 3
 p2.food_track = 2
-p2.tools = [1, 3]
+p2.tools = bytearray([1, 3, 0])
 p2.score = 48
 p2.workers = 7
 
 # Add a building to Player 2
 building = Building("Field", {ResourceType.WOOD: 2, ResourceType.BRICK: 2}, 8)
-p2.buildings.append(building)
+p2.add_building(building)
 
 # Display the visualization
 display_round_start(engine.game_state, 5)
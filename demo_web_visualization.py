@@ -24,7 +24,7 @@ print()
 random.seed(42)
 
 # Create game with web visualization
-engine = GameEngine(num_players=2, enable_visualization=True)
+engine = GameEngine(num_players=2, enable_visualization=True, seed=42)
 
 # Start the web visualization
 from web_visualization import start_web_visualization
@@ -89,14 +89,14 @@ p1.resources.stone = 5
 p1.resources.gold = 2
 p1.resources.food = 6
 p1.food_track = 3
-p1.tools = [1, 2, 2]
+p1.tools = bytearray([1, 2, 2])
 p1.score = 45
 p1.workers = 8
 
 # Add a civilization card to Player 1
 if engine.game_state.board.civilization_cards:
     card = engine.game_state.board.civilization_cards[0]
-    p1.civilization_cards.append(card)
+    p1.add_civilization_card(card)
 
 p2.resources.wood = 5
 p2.resources.brick = 7
@@ -104,14 +104,14 @@ p2.resources.stone = 3
 p2.resources.gold = 3
 p2.resources.food = 4
 p2.food_track = 2
-p2.tools = [1, 3]
+p2.tools = bytearray([1, 3, 0])
 p2.score = 38
 p2.workers = 7
 
 # Add a building to Player 2 (use existing building from board)
 if engine.game_state.board.buildings:
     building = engine.game_state.board.buildings[0]
-    p2.buildings.append(building)
+    p2.add_building(building)
 
 engine.web_visualizer.save_state_to_file()
 
@@ -123,7 +123,7 @@ print()
 print("The web visualization is now showing the game state.")
 print("Open your browser to: http://localhost:8080")
 print()
-print("The page auto-refreshes every 3 seconds.")
+print("The page updates automatically as the game state changes.")
 print()
 print("Press Ctrl+C to stop the server and exit.")
 print()
@@ -4,86 +4,137 @@ Stone Age Game Engine Module
 This module implements the main game loop and orchestrates the game flow.
 """
 
-from game_state import GameState, ActionSpace
+import sys
+from typing import Optional
+from game_state import GameState, ActionSpace, ACTION_INDEX
 from ai_player import AIPlayer
 
 
+# Log banner and separator lines
+_BANNER = "=" * 80
+_SEP = "-" * 80
+
+# Player status logged at the start of their placement turn; resources are
+# positional fields in Resources.as_tuple() order
+_PLAYER_TURN_TMPL = ("\n{name}'s turn to place workers:\n"
+                     "  Available workers: {workers}\n"
+                     "  Resources: Wood={0}, Brick={1}, Stone={2}, Gold={3}, Food={4}")
+
+# Order in which action spaces are resolved each round
+_ACTION_ORDER = (
+    ActionSpace.HUNTING_GROUNDS,
+    ActionSpace.FOREST,
+    ActionSpace.CLAY_PIT,
+    ActionSpace.QUARRY,
+    ActionSpace.RIVER,
+    ActionSpace.FARM,
+    ActionSpace.TOOL_MAKER,
+    ActionSpace.HUT,
+    ActionSpace.CIVILIZATION_CARD,
+    ActionSpace.BUILDING,
+)
+# (space, worker_counts row) pairs in resolution order
+_ACTION_ORDER_IDX = tuple((action, ACTION_INDEX[action]) for action in _ACTION_ORDER)
+
+
 class GameEngine:
     """Main game engine that runs the Stone Age game"""
     
-    def __init__(self, num_players: int = 2, enable_visualization: bool = False):
+    def __init__(self, num_players: int = 2, enable_visualization: bool = False,
+                 seed: Optional[int] = None, verbose: bool = True):
         self.game_state = GameState(num_players)
-        self.ai_players = [AIPlayer(i) for i in range(num_players)]
+        self.ai_players = [AIPlayer(i, seed) for i in range(num_players)]
         self.game_log = []
+        self.verbose = verbose  # If False, nothing is printed and per-action log lines are skipped
+        self._log_buf = []  # Lines waiting to be written to stdout
         self.enable_visualization = enable_visualization
         self.web_visualizer = None
     
     def log(self, message: str):
         """Add a message to the game log"""
-        print(message)
         self.game_log.append(message)
+        if self.verbose:
+            self._log_buf.append(message)
+    
+    def _flush_log(self):
+        """Write the buffered log lines to stdout in one call"""
+        if self._log_buf:
+            sys.stdout.write("\n".join(self._log_buf) + "\n")
+            self._log_buf.clear()
     
     def run_game(self):
         """Run the complete game from start to finish"""
-        self.log("=" * 80)
+        self.log(_BANNER)
         self.log("STONE AGE - AI SIMULATION")
-        self.log("=" * 80)
+        self.log(_BANNER)
         self.log(f"Starting game with {len(self.game_state.players)} players")
         self.log("")
         
         # Start web visualization if enabled
         if self.enable_visualization:
             from web_visualization import start_web_visualization
+            self._flush_log()  # The visualizer prints directly, so write the banner out first
             self.web_visualizer = start_web_visualization(self.game_state)
         
-        # Main game loop
-        while not self.game_state.is_game_over():
-            self.game_state.current_round += 1
+        # Main game loop: play up to max_rounds, stopping early if the card deck runs out
+        game_state = self.game_state
+        for current_round in range(game_state.current_round + 1, game_state.max_rounds + 1):
+            if game_state.board.cards_empty:
+                break
+            game_state.current_round = current_round
             self.run_round()
         
         # Game over
         self.log("")
-        self.log("=" * 80)
+        self.log(_BANNER)
         self.log("GAME OVER")
-        self.log("=" * 80)
+        self.log(_BANNER)
         self.display_final_scores()
+        self._publish_state()
+        self._flush_log()
         
         # Keep web server running if visualization is enabled
         if self.enable_visualization and self.web_visualizer:
             self.log("\nWeb visualization is still running. Press Ctrl+C to exit.")
+            self._flush_log()
             try:
                 import time
                 while True:
                     time.sleep(1)
             except KeyboardInterrupt:
                 self.log("\nShutting down...")
+                self._flush_log()
                 self.web_visualizer.stop_server()
     
     def run_round(self):
         """Run a single round of the game"""
         self.log("")
-        self.log("=" * 80)
+        self.log(_BANNER)
         self.log(f"ROUND {self.game_state.current_round}")
-        self.log("=" * 80)
+        self.log(_BANNER)
         
         # Update web visualization if enabled
         if self.enable_visualization and self.web_visualizer:
+            self._flush_log()  # Keep the round banner ahead of the visualizer's own output
             self.web_visualizer.display_round(self.game_state.current_round)
         
         # Phase 1: Place workers
         self.log("")
         self.log("--- Phase 1: Worker Placement ---")
         self.phase_place_workers()
+        self._publish_state()
         
         # Phase 2: Resolve actions
         self.log("")
         self.log("--- Phase 2: Action Resolution ---")
         self.phase_resolve_actions()
+        self._publish_state()
         
         # Phase 3: Feed workers
         self.log("")
         self.log("--- Phase 3: Feeding ---")
         self.phase_feed_workers()
+        self._publish_state()
         
         # Display round summary
         self.log("")
@@ -92,12 +143,19 @@ class GameEngine:
         
         # Clear workers from board for next round
         self.game_state.board.clear_workers()
+        self._flush_log()
+    
+    def _publish_state(self):
+        """Push the current state to the web visualization, if it is running"""
+        if self.enable_visualization and self.web_visualizer:
+            self.web_visualizer.save_state_to_file()
     
     def phase_place_workers(self):
         """Phase 1: Each player places workers on action spaces"""
         # Players take turns placing workers
         num_players = len(self.game_state.players)
         start_player = self.game_state.starting_player
+        verbose = self.verbose
         
         # Each player places all their workers
         for i in range(num_players):
@@ -105,10 +163,9 @@ class GameEngine:
             player = self.game_state.players[player_index]
             ai = self.ai_players[player_index]
             
-            self.log(f"\n{player.name}'s turn to place workers:")
-            self.log(f"  Available workers: {player.workers}")
-            self.log(f"  Resources: Wood={player.resources.wood}, Brick={player.resources.brick}, "
-                    f"Stone={player.resources.stone}, Gold={player.resources.gold}, Food={player.resources.food}")
+            if verbose:
+                self.log(_PLAYER_TURN_TMPL.format(*player.resources.as_tuple(),
+                                                  name=player.name, workers=player.workers))
             
             # AI decides where to place workers
             placements = ai.decide_worker_placement(self.game_state)
@@ -116,59 +173,48 @@ class GameEngine:
             # Place workers on chosen spaces
             for action, count in placements:
                 if self.game_state.board.place_workers(action, player_index, count):
-                    self.log(f"  Placed {count} worker(s) on {action.value}")
-                else:
+                    if verbose:
+                        self.log(f"  Placed {count} worker(s) on {action.value}")
+                elif verbose:
                     self.log(f"  Failed to place {count} worker(s) on {action.value} (space full)")
     
     def phase_resolve_actions(self):
         """Phase 2: Resolve all placed actions"""
-        # Resolve each action space in order
-        action_order = [
-            ActionSpace.HUNTING_GROUNDS,
-            ActionSpace.FOREST,
-            ActionSpace.CLAY_PIT,
-            ActionSpace.QUARRY,
-            ActionSpace.RIVER,
-            ActionSpace.FARM,
-            ActionSpace.TOOL_MAKER,
-            ActionSpace.HUT,
-            ActionSpace.CIVILIZATION_CARD,
-            ActionSpace.BUILDING,
-        ]
+        verbose = self.verbose
+        board = self.game_state.board
         
-        for action in action_order:
-            placed = self.game_state.board.placed_workers[action]
-            
-            if not placed:
+        # Resolve each action space in order
+        for action, row_index in _ACTION_ORDER_IDX:
+            row = board.worker_counts[row_index]
+            if not any(row):
                 continue
             
-            # Group workers by player
-            player_workers = {}
-            for player_index in placed:
-                if player_index not in player_workers:
-                    player_workers[player_index] = 0
-                player_workers[player_index] += 1
-            
-            # Resolve for each player
-            for player_index, worker_count in player_workers.items():
+            # Resolve for each player with workers here
+            for player_index, worker_count in enumerate(row):
+                if not worker_count:
+                    continue
                 ai = self.ai_players[player_index]
                 log_msg = ai.resolve_action(self.game_state, action, worker_count)
-                self.log(f"  {log_msg}")
+                if verbose:
+                    self.log(f"  {log_msg}")
     
     def phase_feed_workers(self):
         """Phase 3: Each player must feed their workers"""
+        verbose = self.verbose
         for i, player in enumerate(self.game_state.players):
-            food_needed = player.workers
-            available_food = player.resources.food + player.food_track
+            food_from_resources = player.resources.food if verbose else 0
+            
+            penalty, available_food = player.feed_workers()
+            
+            if not verbose:
+                continue
             
             self.log(f"\n{player.name} feeding phase:")
-            self.log(f"  Workers to feed: {food_needed}")
+            self.log(f"  Workers to feed: {player.workers}")
             self.log(f"  Food from track: {player.food_track}")
-            self.log(f"  Food from resources: {player.resources.food}")
+            self.log(f"  Food from resources: {food_from_resources}")
             self.log(f"  Total available: {available_food}")
             
-            penalty = player.feed_workers()
-            
             if penalty > 0:
                 self.log(f"  ⚠️  Couldn't feed all workers! Penalty: -{penalty} points")
             else:
@@ -176,11 +222,13 @@ class GameEngine:
     
     def display_round_summary(self):
         """Display summary of player states after the round"""
+        if not self.verbose:
+            return
         for player in self.game_state.players:
             self.log(f"\n{player.name}:")
             self.log(f"  Workers: {player.workers}")
             self.log(f"  Food production: {player.food_track}/round")
-            self.log(f"  Tools: {player.tools}")
+            self.log(f"  Tools: {player.owned_tools()}")
             self.log(f"  Resources: W={player.resources.wood} B={player.resources.brick} "
                     f"S={player.resources.stone} G={player.resources.gold} F={player.resources.food}")
             self.log(f"  Civilization cards: {len(player.civilization_cards)}")
@@ -191,26 +239,28 @@ class GameEngine:
         """Display final scores and determine winner"""
         self.log("")
         self.log("FINAL SCORES:")
-        self.log("-" * 80)
+        self.log(_SEP)
         
         final_scores = []
+        verbose = self.verbose
         
         for player in self.game_state.players:
-            final_score = player.calculate_final_score()
+            final_score = player.finalize()
             final_scores.append((player, final_score))
             
+            if not verbose:
+                continue
+            
             self.log(f"\n{player.name}:")
             self.log(f"  Base score: {player.score}")
             
             # Civilization card points
-            card_points = sum(card.points for card in player.civilization_cards)
-            self.log(f"  Civilization cards ({len(player.civilization_cards)}): +{card_points} points")
+            self.log(f"  Civilization cards ({len(player.civilization_cards)}): +{player.card_points} points")
             for card in player.civilization_cards:
                 self.log(f"    - {card}")
             
             # Building points
-            building_points = sum(building.points for building in player.buildings)
-            self.log(f"  Buildings ({len(player.buildings)}): +{building_points} points")
+            self.log(f"  Buildings ({len(player.buildings)}): +{player.building_points} points")
             for building in player.buildings:
                 self.log(f"    - {building}")
             
@@ -221,14 +271,12 @@ class GameEngine:
             self.log(f"  TOTAL: {final_score} points")
         
         # Determine winner
-        final_scores.sort(key=lambda x: x[1], reverse=True)
-        winner = final_scores[0][0]
-        winning_score = final_scores[0][1]
+        winner, winning_score = max(final_scores, key=lambda x: x[1])
         
         self.log("")
-        self.log("=" * 80)
+        self.log(_BANNER)
         self.log(f"🏆 WINNER: {winner.name} with {winning_score} points! 🏆")
-        self.log("=" * 80)
+        self.log(_BANNER)
     
     def get_game_summary(self) -> dict:
         """Get a summary of the game results"""
@@ -257,17 +305,20 @@ def main():
     # Check if visualization is enabled via command line argument
     enable_viz = '--visualize' in sys.argv or '-v' in sys.argv
     
+    # Quiet mode skips the play-by-play log and only prints the statistics
+    quiet = '--quiet' in sys.argv or '-q' in sys.argv
+    
     # Create and run game
-    engine = GameEngine(num_players=2, enable_visualization=enable_viz)
+    engine = GameEngine(num_players=2, enable_visualization=enable_viz, verbose=not quiet)
     engine.run_game()
     
     # Get summary
     summary = engine.get_game_summary()
     
     print("\n")
-    print("=" * 80)
+    print(_BANNER)
     print("GAME STATISTICS")
-    print("=" * 80)
+    print(_BANNER)
     print(f"Total rounds played: {summary['rounds_played']}")
     print(f"Winner: {summary['winner']}")
     print(f"Final scores: {summary['final_scores']}")
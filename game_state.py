@@ -5,10 +5,17 @@ This module defines the core game state including board setup, player state,
 and resource management for the Stone Age board game simulation.
 """
 
+import copy
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
 from enum import Enum
 import random
+import sys
+
+
+# Dataclass options: use __slots__ where supported (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class ResourceType(Enum):
@@ -20,6 +27,14 @@ class ResourceType(Enum):
     FOOD = "Food"
 
 
+# Tool slots per player; a slot holding 0 is empty
+MAX_TOOLS = 3
+
+
+# Position of each resource in fixed-size per-resource arrays (wood, brick, stone, gold, food)
+RESOURCE_INDEX = {resource_type: i for i, resource_type in enumerate(ResourceType)}
+
+
 class ActionSpace(Enum):
     """Available action spaces on the board"""
     FOREST = "Forest"  # Collect wood
@@ -34,59 +49,79 @@ class ActionSpace(Enum):
     BUILDING = "Building"  # Build a building
 
 
-@dataclass
+# Row of each action space in Board.worker_counts
+ACTION_INDEX = {action: i for i, action in enumerate(ActionSpace)}
+
+
+def _amount_property(index: int, doc: str) -> property:
+    """Create a read/write property backed by one slot of Resources.amounts"""
+    def getter(self) -> int:
+        return self.amounts[index]
+    
+    def setter(self, value: int):
+        self.amounts[index] = value
+        self._version += 1
+    
+    return property(getter, setter, doc=doc)
+
+
 class Resources:
-    """Player's resource inventory"""
-    wood: int = 0
-    brick: int = 0
-    stone: int = 0
-    gold: int = 0
-    food: int = 0
+    """
+    Player's resource inventory, stored as one count per resource (RESOURCE_INDEX order).
+    _version is bumped by every change made through add/spend or the properties.
+    """
+    
+    __slots__ = ("amounts", "_version")
+    
+    def __init__(self, wood: int = 0, brick: int = 0, stone: int = 0, gold: int = 0, food: int = 0):
+        self.amounts = [wood, brick, stone, gold, food]
+        self._version = 0
+    
+    wood = _amount_property(0, "Wood count")
+    brick = _amount_property(1, "Brick count")
+    stone = _amount_property(2, "Stone count")
+    gold = _amount_property(3, "Gold count")
+    food = _amount_property(4, "Food count")
+    
+    def __repr__(self):
+        return (f"Resources(wood={self.wood}, brick={self.brick}, stone={self.stone}, "
+                f"gold={self.gold}, food={self.food})")
+    
+    def __eq__(self, other):
+        if not isinstance(other, Resources):
+            return NotImplemented
+        return self.amounts == other.amounts
 
     def add(self, resource_type: ResourceType, amount: int):
         """Add resources"""
-        if resource_type == ResourceType.WOOD:
-            self.wood += amount
-        elif resource_type == ResourceType.BRICK:
-            self.brick += amount
-        elif resource_type == ResourceType.STONE:
-            self.stone += amount
-        elif resource_type == ResourceType.GOLD:
-            self.gold += amount
-        elif resource_type == ResourceType.FOOD:
-            self.food += amount
-
-    def can_afford(self, cost: Dict[ResourceType, int]) -> bool:
-        """Check if player has enough resources"""
-        for resource_type, amount in cost.items():
-            if resource_type == ResourceType.WOOD and self.wood < amount:
-                return False
-            elif resource_type == ResourceType.BRICK and self.brick < amount:
-                return False
-            elif resource_type == ResourceType.STONE and self.stone < amount:
-                return False
-            elif resource_type == ResourceType.GOLD and self.gold < amount:
-                return False
-        return True
-
-    def spend(self, cost: Dict[ResourceType, int]):
-        """Spend resources"""
-        for resource_type, amount in cost.items():
-            if resource_type == ResourceType.WOOD:
-                self.wood -= amount
-            elif resource_type == ResourceType.BRICK:
-                self.brick -= amount
-            elif resource_type == ResourceType.STONE:
-                self.stone -= amount
-            elif resource_type == ResourceType.GOLD:
-                self.gold -= amount
+        self.amounts[RESOURCE_INDEX[resource_type]] += amount
+        self._version += 1
+
+    def can_afford(self, cost: Sequence[int]) -> bool:
+        """Check if player has enough resources for a per-resource cost vector"""
+        return all(have >= need for have, need in zip(self.amounts, cost))
+
+    def spend(self, cost: Sequence[int]):
+        """Spend resources given as a per-resource cost vector"""
+        self.amounts = [have - need for have, need in zip(self.amounts, cost)]
+        self._version += 1
 
     def total_value(self) -> int:
         """Calculate total resource value"""
-        return self.wood + self.brick + self.stone + self.gold
+        return sum(self.amounts[:4])  # Food is not counted
+
+    def copy(self) -> "Resources":
+        """Get an independent copy of this inventory (the version carries over)"""
+        clone = Resources(*self.amounts)
+        clone._version = self._version
+        return clone
+    
+    def as_tuple(self) -> Tuple[int, int, int, int, int]:
+        """Get resource counts as a (wood, brick, stone, gold, food) tuple"""
+        return tuple(self.amounts)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CivilizationCard:
     """Represents a civilization card"""
     name: str
@@ -97,41 +132,80 @@ class CivilizationCard:
         return f"{self.name} ({self.points}pts)"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Building:
     """Represents a building tile"""
     name: str
     cost: Dict[ResourceType, int]
     points: int
+    cost_vector: Tuple[int, ...] = field(init=False, repr=False, compare=False)  # Cost per RESOURCE_INDEX
+    
+    def __post_init__(self):
+        """Precompute the cost as a per-resource vector"""
+        vector = [0] * len(RESOURCE_INDEX)
+        for resource_type, amount in self.cost.items():
+            vector[RESOURCE_INDEX[resource_type]] = amount
+        self.cost_vector = tuple(vector)
     
     def __repr__(self):
         return f"{self.name} ({self.points}pts)"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Player:
     """Represents a player in the game"""
     name: str
     workers: int = 5
     food_track: int = 0  # Permanent food production
-    tools: List[int] = field(default_factory=lambda: [])  # Tool values
+    tools: bytearray = field(default_factory=lambda: bytearray(MAX_TOOLS))  # Tool values, 0 = empty slot
     resources: Resources = field(default_factory=Resources)
     civilization_cards: List[CivilizationCard] = field(default_factory=list)
     buildings: List[Building] = field(default_factory=list)
     score: int = 0
+    _card_points: int = field(default=0, init=False, repr=False, compare=False)  # Sum over civilization_cards
+    _building_points: int = field(default=0, init=False, repr=False, compare=False)  # Sum over buildings
+    _final_score: Optional[int] = field(default=None, init=False, repr=False, compare=False)  # Set by finalize()
+    
+    def __post_init__(self):
+        """Start the running point totals from the cards and buildings passed in"""
+        self._card_points = sum(card.points for card in self.civilization_cards)
+        self._building_points = sum(building.points for building in self.buildings)
+    
+    @property
+    def card_points(self) -> int:
+        """Total points of the civilization cards taken so far"""
+        return self._card_points
+    
+    @property
+    def building_points(self) -> int:
+        """Total points of the buildings built so far"""
+        return self._building_points
+    
+    def clone(self) -> "Player":
+        """Copy the player so the copy can change without affecting this one"""
+        clone = copy.copy(self)
+        clone.tools = bytearray(self.tools)
+        clone.resources = self.resources.copy()
+        clone.civilization_cards = list(self.civilization_cards)
+        clone.buildings = list(self.buildings)
+        return clone
+    
+    def add_civilization_card(self, card: CivilizationCard):
+        """Take a civilization card and count its points"""
+        self.civilization_cards.append(card)
+        self._card_points += card.points
+    
+    def add_building(self, building: Building):
+        """Take a building and count its points"""
+        self.buildings.append(building)
+        self._building_points += building.points
     
     def available_workers(self) -> int:
         """Get number of available workers"""
         return self.workers
     
-    def can_feed_workers(self) -> bool:
-        """Check if player can feed all workers"""
-        required_food = self.workers
-        available_food = self.resources.food + self.food_track
-        return available_food >= required_food
-    
-    def feed_workers(self) -> int:
-        """Feed workers and return penalty if unable"""
+    def feed_workers(self) -> Tuple[int, int]:
+        """Feed workers and return (penalty if unable, food that was available)"""
         required_food = self.workers
         available_food = self.resources.food + self.food_track
         
@@ -140,25 +214,35 @@ class Player:
             used_from_track = min(self.food_track, required_food)
             used_from_resources = required_food - used_from_track
             self.resources.food -= used_from_resources
-            return 0
+            return 0, available_food
         else:
             # Take penalty for each missing food
             penalty = (required_food - available_food) * 10
             self.score = max(0, self.score - penalty)
             self.resources.food = 0
-            return penalty
+            return penalty, available_food
     
     def add_tool(self):
         """Add a new tool"""
-        if len(self.tools) < 3:
-            self.tools.append(1)
+        tools = self.tools
+        empty = tools.find(0)
+        if empty >= 0:
+            tools[empty] = 1
         else:
             # Upgrade existing tools
-            for i in range(len(self.tools)):
-                if self.tools[i] < 4:
-                    self.tools[i] += 1
+            for i in range(MAX_TOOLS):
+                if tools[i] < 4:
+                    tools[i] += 1
                     break
     
+    def tool_count(self) -> int:
+        """Get number of tools owned"""
+        return MAX_TOOLS - self.tools.count(0)
+    
+    def owned_tools(self) -> List[int]:
+        """Get the values of the tools owned, in slot order"""
+        return [tool for tool in self.tools if tool]
+    
     def add_worker(self):
         """Add a new worker"""
         if self.workers < 10:
@@ -166,35 +250,51 @@ class Player:
     
     def use_tool(self, index: int) -> int:
         """Use a tool and return its value"""
-        if 0 <= index < len(self.tools):
+        if 0 <= index < MAX_TOOLS:
             return self.tools[index]
         return 0
     
     def calculate_final_score(self) -> int:
         """Calculate final score including civilization cards and buildings"""
-        total = self.score
-        
-        # Add points from civilization cards
-        for card in self.civilization_cards:
-            total += card.points
-        
-        # Add points from buildings
-        for building in self.buildings:
-            total += building.points
-        
+        if self._final_score is not None:
+            return self._final_score
         # Resource bonus: 1 point per resource
-        total += self.resources.total_value()
-        
-        return total
+        return self.score + self._card_points + self._building_points + self.resources.total_value()
+    
+    def finalize(self) -> int:
+        """Fix the final score once the game is over; later calls to calculate_final_score reuse it"""
+        self._final_score = None
+        self._final_score = self.calculate_final_score()
+        return self._final_score
+
+
+# Number of face-up civilization cards and building tiles on display
+FACE_UP_SLOTS = 4
+
+
+def _fill_slots(slots: list, items: Sequence):
+    """Copy the first FACE_UP_SLOTS items into a fixed-size slot list, padding with None"""
+    count = len(items)
+    for i in range(FACE_UP_SLOTS):
+        slots[i] = items[i] if i < count else None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Board:
     """Represents the game board"""
-    civilization_cards: List[CivilizationCard] = field(default_factory=list)
+    num_players: int = 2
+    civilization_cards: deque = field(default_factory=deque)  # Draw pile, top card first
     buildings: List[Building] = field(default_factory=list)
     action_spaces: Dict[ActionSpace, int] = field(default_factory=dict)  # Space -> max workers
-    placed_workers: Dict[ActionSpace, List[int]] = field(default_factory=dict)  # Space -> player indices
+    worker_counts: List[bytearray] = field(default_factory=list)  # [ACTION_INDEX[space]][player] -> workers
+    placed_worker_counts: Dict[ActionSpace, int] = field(default_factory=dict)  # Space -> workers placed
+    buildings_version: int = field(default=0, init=False, repr=False, compare=False)  # Bumped when buildings change
+    cards_empty: bool = field(default=False, init=False, repr=False, compare=False)  # Set once the deck runs out
+    _building_table: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    face_up_cards: List[Optional[CivilizationCard]] = field(
+        default_factory=lambda: [None] * FACE_UP_SLOTS, init=False, repr=False, compare=False)
+    face_up_buildings: List[Optional[Building]] = field(
+        default_factory=lambda: [None] * FACE_UP_SLOTS, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Initialize board with default configuration"""
@@ -213,8 +313,9 @@ class Board:
         }
         
         # Initialize placed workers tracking
+        self.worker_counts = [bytearray(self.num_players) for _ in ActionSpace]
         for space in self.action_spaces:
-            self.placed_workers[space] = []
+            self.placed_worker_counts[space] = 0
         
         # Initialize civilization cards
         self._setup_civilization_cards()
@@ -235,7 +336,9 @@ class Board:
             CivilizationCard("Transport", 11),
         ]
         random.shuffle(cards)
-        self.civilization_cards = cards
+        self.civilization_cards = deque(cards)
+        self.cards_empty = not cards
+        _fill_slots(self.face_up_cards, self.civilization_cards)
     
     def _setup_buildings(self):
         """Create the building tiles"""
@@ -248,37 +351,76 @@ class Board:
             Building("Palace", {ResourceType.STONE: 4, ResourceType.GOLD: 2}, 18),
         ]
         random.shuffle(buildings)
-        self.buildings = buildings[:4]  # Only 4 buildings available at a time
+        self.buildings = buildings[:FACE_UP_SLOTS]  # Only 4 buildings available at a time
+        _fill_slots(self.face_up_buildings, self.buildings)
+        self.buildings_version += 1
+    
+    def clone(self) -> "Board":
+        """
+        Copy the board so the copy can change without affecting this one.
+        Cards, buildings and the action space limits are never modified, so they are shared.
+        """
+        clone = copy.copy(self)
+        clone.civilization_cards = deque(self.civilization_cards)
+        clone.buildings = list(self.buildings)
+        clone.worker_counts = [bytearray(row) for row in self.worker_counts]
+        clone.placed_worker_counts = dict(self.placed_worker_counts)
+        clone.face_up_cards = list(self.face_up_cards)
+        clone.face_up_buildings = list(self.face_up_buildings)
+        return clone
+    
+    def building_table(self) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[int, ...]]:
+        """
+        Get parallel (costs, points) views of the available buildings.
+        Each cost is a per-resource tuple indexed by RESOURCE_INDEX. The table is
+        rebuilt only when buildings_version changes.
+        """
+        table = self._building_table
+        if table is None or table[0] != self.buildings_version:
+            costs = tuple(building.cost_vector for building in self.buildings)
+            points = tuple(building.points for building in self.buildings)
+            table = self._building_table = (self.buildings_version, costs, points)
+        return table[1], table[2]
     
     def can_place_workers(self, space: ActionSpace, count: int) -> bool:
         """Check if workers can be placed on this space"""
-        current = len(self.placed_workers[space])
+        current = self.placed_worker_counts[space]
         max_workers = self.action_spaces[space]
         return current + count <= max_workers
     
     def place_workers(self, space: ActionSpace, player_index: int, count: int) -> bool:
         """Place workers on an action space"""
         if self.can_place_workers(space, count):
-            for _ in range(count):
-                self.placed_workers[space].append(player_index)
+            self.worker_counts[ACTION_INDEX[space]][player_index] += count
+            self.placed_worker_counts[space] += count
             return True
         return False
     
     def clear_workers(self):
-        """Clear all placed workers from the board"""
+        """Clear all placed workers from the board, reusing the existing rows"""
+        zeros = bytes(self.num_players)
+        for row in self.worker_counts:
+            row[:] = zeros
         for space in self.action_spaces:
-            self.placed_workers[space] = []
+            self.placed_worker_counts[space] = 0
     
     def get_available_civilization_card(self) -> Optional[CivilizationCard]:
         """Get and remove a civilization card from the deck"""
         if self.civilization_cards:
-            return self.civilization_cards.pop(0)
+            card = self.civilization_cards.popleft()
+            if not self.civilization_cards:
+                self.cards_empty = True
+            _fill_slots(self.face_up_cards, self.civilization_cards)
+            return card
         return None
     
     def get_available_building(self, index: int) -> Optional[Building]:
         """Get and remove a building from available tiles"""
         if 0 <= index < len(self.buildings):
-            return self.buildings.pop(index)
+            self.buildings_version += 1
+            building = self.buildings.pop(index)
+            _fill_slots(self.face_up_buildings, self.buildings)
+            return building
         return None
 
 
@@ -287,24 +429,28 @@ class GameState:
     
     def __init__(self, num_players: int = 2):
         self.players = [Player(f"Player {i+1}") for i in range(num_players)]
-        self.board = Board()
+        self.board = Board(num_players)
         self.current_round = 0
         self.max_rounds = 10
         self.starting_player = 0
     
+    def clone(self) -> "GameState":
+        """
+        Copy the game state for lookahead: the copy can be played forward
+        without touching this state.
+        """
+        clone = GameState.__new__(GameState)
+        clone.players = [player.clone() for player in self.players]
+        clone.board = self.board.clone()
+        clone.current_round = self.current_round
+        clone.max_rounds = self.max_rounds
+        clone.starting_player = self.starting_player
+        return clone
+    
     def is_game_over(self) -> bool:
         """Check if the game is over"""
-        return self.current_round >= self.max_rounds or len(self.board.civilization_cards) == 0
+        return self.current_round >= self.max_rounds or self.board.cards_empty
     
-    def get_winner(self) -> Player:
-        """Determine the winner"""
-        winner = None
-        max_score = -1
-        
-        for player in self.players:
-            final_score = player.calculate_final_score()
-            if final_score > max_score:
-                max_score = final_score
-                winner = player
-        
-        return winner
+    def get_winner(self) -> Optional[Player]:
+        """Determine the winner (the first player with the top score)"""
+        return max(self.players, key=Player.calculate_final_score, default=None)
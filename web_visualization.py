@@ -5,125 +5,93 @@ This module provides a web-based visualization of the Stone Age game board,
 using a simple HTTP server and HTML/CSS/JavaScript frontend.
 """
 
+import gzip
+import hashlib
 import json
 import http.server
-import socketserver
+import os
+import queue
+from operator import attrgetter
 import threading
 import webbrowser
 import time
 from pathlib import Path
-from typing import Optional
-from game_state import GameState, ActionSpace, ResourceType
+from typing import Callable, Optional, Tuple
+from game_state import GameState, Player, ResourceType
 
 
-class GameStateEncoder(json.JSONEncoder):
-    """Custom JSON encoder for game state objects"""
-    
-    def default(self, obj):
-        if isinstance(obj, ActionSpace):
-            return obj.value
-        elif isinstance(obj, ResourceType):
-            return obj.value
-        elif hasattr(obj, '__dict__'):
-            return obj.__dict__
-        return super().default(obj)
+# Seconds between keep-alive comments on an idle /events stream
+SSE_KEEPALIVE_SECONDS = 15.0
 
+# gzip level for the precompressed state: level 1 is several times faster than the
+# default and the state JSON still shrinks to a fraction of its size
+STATE_GZIP_LEVEL = 1
 
-class WebVisualizer:
-    """Handles web-based visualization of the Stone Age game board"""
+# Worker threads serving HTTP requests; open /events streams run on threads of their own
+SERVER_WORKERS = 8
+
+# Open /events streams allowed at once; further streams are answered with 503
+SSE_MAX_STREAMS = 32
+
+# Exported name of each resource, looked up once instead of reading .value per cost entry
+_RES_VALUE = {resource_type: resource_type.value for resource_type in ResourceType}
+
+# Exported resource keys in Resources.as_tuple() order (wood, brick, stone, gold, food)
+_RES_KEYS = tuple(resource_type.name.lower() for resource_type in ResourceType)
+
+# (name, points) of a card or building in one call
+_NAME_POINTS = attrgetter('name', 'points')
+
+
+def _export_cards(cards) -> list:
+    """Export civilization cards as plain dicts, skipping empty slots"""
+    return [{'name': name, 'points': points}
+            for name, points in map(_NAME_POINTS, (card for card in cards if card is not None))]
+
+
+def _export_buildings(buildings) -> list:
+    """Export buildings as plain dicts, skipping empty slots"""
+    return [{'name': building.name,
+             'points': building.points,
+             'cost': {_RES_VALUE[res]: amt for res, amt in building.cost.items()}}
+            for building in buildings if building is not None]
+
+
+def _select_json_backend() -> Tuple[str, Callable[[dict], bytes]]:
+    """
+    Pick the fastest installed JSON library for serializing exported states:
+    orjson, then ujson, then rapidjson, then the standard library. All are optional.
+    """
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return 'orjson', orjson.dumps
     
-    def __init__(self, game_state: GameState, port: int = 8080):
-        self.game_state = game_state
-        self.port = port
-        self.server = None
-        self.server_thread = None
-        self.latest_state = None
-        
-    def export_game_state(self) -> dict:
-        """Export game state as JSON-serializable dictionary"""
-        state = {
-            'current_round': self.game_state.current_round,
-            'max_rounds': self.game_state.max_rounds,
-            'players': [],
-            'board': {
-                'civilization_cards': [],
-                'buildings': [],
-                'action_spaces': {},
-                'placed_workers': {}
-            }
-        }
-        
-        # Export players
-        for i, player in enumerate(self.game_state.players):
-            state['players'].append({
-                'name': player.name,
-                'workers': player.workers,
-                'food_track': player.food_track,
-                'tools': player.tools,
-                'score': player.score,
-                'resources': {
-                    'wood': player.resources.wood,
-                    'brick': player.resources.brick,
-                    'stone': player.resources.stone,
-                    'gold': player.resources.gold,
-                    'food': player.resources.food
-                },
-                'civilization_cards': [
-                    {'name': card.name, 'points': card.points}
-                    for card in player.civilization_cards
-                ],
-                'buildings': [
-                    {
-                        'name': building.name,
-                        'points': building.points,
-                        'cost': {res.value: amt for res, amt in building.cost.items()}
-                    }
-                    for building in player.buildings
-                ]
-            })
-        
-        # Export board
-        for card in self.game_state.board.civilization_cards[:4]:
-            state['board']['civilization_cards'].append({
-                'name': card.name,
-                'points': card.points
-            })
-        
-        for building in self.game_state.board.buildings[:4]:
-            state['board']['buildings'].append({
-                'name': building.name,
-                'points': building.points,
-                'cost': {res.value: amt for res, amt in building.cost.items()}
-            })
-        
-        # Export action spaces and worker placements
-        for action, max_workers in self.game_state.board.action_spaces.items():
-            state['board']['action_spaces'][action.value] = max_workers
-            workers = self.game_state.board.placed_workers[action]
-            state['board']['placed_workers'][action.value] = len(workers)
-        
-        return state
+    try:
+        import ujson
+    except ImportError:
+        pass
+    else:
+        return 'ujson', lambda state: ujson.dumps(state).encode('utf-8')
     
-    def save_state_to_file(self):
-        """Save current game state to a JSON file for the web interface"""
-        state = self.export_game_state()
-        self.latest_state = state
-        
-        web_dir = Path(__file__).parent / 'web'
-        web_dir.mkdir(exist_ok=True)
-        
-        state_file = web_dir / 'game_state.json'
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
-        
-        return state_file
+    try:
+        import rapidjson
+    except ImportError:
+        pass
+    else:
+        return 'rapidjson', lambda state: rapidjson.dumps(state).encode('utf-8')
     
-    def create_html_file(self):
-        """Create the HTML file for the web visualization"""
-        web_dir = Path(__file__).parent / 'web'
-        web_dir.mkdir(exist_ok=True)
-        
-        html_content = '''<!DOCTYPE html>
+    return 'json', lambda state: json.dumps(state, separators=(',', ':')).encode('utf-8')
+
+
+# Name of the JSON library in use, and dumps_state(state) -> compact UTF-8 JSON bytes
+JSON_BACKEND, dumps_state = _select_json_backend()
+
+
+# Static page for the web visualization, encoded once at import
+_INDEX_HTML = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -467,10 +435,18 @@ class WebVisualizer:
             'Hut': { icon: '🏠', special: true }
         };
         
+        let lastEtag = null;
+        
         async function loadGameState() {
             try {
-                const response = await fetch('game_state.json');
+                // Revalidate with the server; unchanged states come back as 304
+                const response = await fetch('game_state.json', { cache: 'no-cache' });
+                const etag = response.headers.get('ETag');
+                if (etag && etag === lastEtag) {
+                    return;
+                }
                 const data = await response.json();
+                lastEtag = etag;
                 renderGameBoard(data);
             } catch (error) {
                 console.error('Error loading game state:', error);
@@ -478,106 +454,196 @@ class WebVisualizer:
             }
         }
         
+        const resourceZoneNames = ['Hunting Grounds', 'Forest', 'Clay Pit', 'Quarry', 'River'];
+        const specialZoneNames = ['Farm', 'Tool Maker', 'Hut'];
+        
+        // DOM nodes that change between states, filled in by initGameBoard
+        let refs = null;
+        
+        // The scoring track never changes, so its markers are built once
+        const scoreMarkers = document.getElementById('score-markers');
+        for (let i = 0; i <= 95; i += 5) {
+            const marker = document.createElement('div');
+            marker.className = 'score-marker';
+            marker.textContent = i;
+            scoreMarkers.appendChild(marker);
+        }
+        
         function renderGameBoard(data) {
-            // Update header
-            document.querySelector('.round-info').textContent = 
-                `Round ${data.current_round} of ${data.max_rounds}`;
-            
-            // Render scoring track markers
-            const scoreMarkers = document.getElementById('score-markers');
-            scoreMarkers.innerHTML = '';
-            for (let i = 0; i <= 95; i += 5) {
-                const marker = document.createElement('div');
-                marker.className = 'score-marker';
-                marker.textContent = i;
-                scoreMarkers.appendChild(marker);
+            if (!refs || refs.players.length !== data.players.length) {
+                refs = initGameBoard(data);
             }
+            updateGameBoard(data);
+        }
+        
+        function initGameBoard(data) {
+            const built = { zones: {}, players: [] };
+            built.round = document.querySelector('.round-info');
             
-            // Render resource zones
+            // Zone headers
             const resourceZones = document.getElementById('resource-zones');
             resourceZones.innerHTML = '';
-            ['Hunting Grounds', 'Forest', 'Clay Pit', 'Quarry', 'River'].forEach(zone => {
-                const workers = data.board.placed_workers[zone] || 0;
-                const maxWorkers = data.board.action_spaces[zone] || 7;
-                resourceZones.appendChild(createZoneCard(zone, workers, maxWorkers));
+            resourceZoneNames.forEach(zone => {
+                const card = createZoneCard(zone);
+                built.zones[zone] = card.querySelector('.worker-count');
+                resourceZones.appendChild(card);
             });
-            
-            // Render special zones
             const specialZones = document.getElementById('special-zones');
             specialZones.innerHTML = '';
-            ['Farm', 'Tool Maker', 'Hut'].forEach(zone => {
-                const workers = data.board.placed_workers[zone] || 0;
-                const maxWorkers = data.board.action_spaces[zone] || 1;
-                specialZones.appendChild(createZoneCard(zone, workers, maxWorkers));
+            specialZoneNames.forEach(zone => {
+                const card = createZoneCard(zone);
+                built.zones[zone] = card.querySelector('.worker-count');
+                specialZones.appendChild(card);
             });
             
-            // Render civilization cards
+            // Civilization cards
             const civCards = document.getElementById('civ-cards');
             civCards.innerHTML = '';
-            const civWorkers = data.board.placed_workers['Civilization Card'] || 0;
-            const civCard = createZoneCard('Civilization Card', civWorkers, 1);
-            const cardList = document.createElement('ul');
-            cardList.className = 'card-list';
-            data.board.civilization_cards.forEach((card, i) => {
-                const li = document.createElement('li');
-                li.className = 'card-item';
-                li.innerHTML = `
-                    <span>📜 ${i + 1}. ${card.name}</span>
-                    <span class="points-badge">${card.points} pts</span>
-                `;
-                cardList.appendChild(li);
-            });
-            civCard.appendChild(cardList);
+            const civCard = createZoneCard('Civilization Card');
+            built.zones['Civilization Card'] = civCard.querySelector('.worker-count');
+            built.cardList = document.createElement('ul');
+            built.cardList.className = 'card-list';
+            built.cardKey = null;
+            civCard.appendChild(built.cardList);
             civCards.appendChild(civCard);
             
-            // Render buildings
+            // Buildings
             const buildings = document.getElementById('buildings');
             buildings.innerHTML = '';
-            const buildWorkers = data.board.placed_workers['Building'] || 0;
-            const buildCard = createZoneCard('Building', buildWorkers, 1);
-            const buildList = document.createElement('ul');
-            buildList.className = 'building-list';
-            data.board.buildings.forEach((building, i) => {
-                const li = document.createElement('li');
-                li.className = 'building-item';
-                const costStr = Object.entries(building.cost)
-                    .map(([res, amt]) => {
-                        const abbrev = {'Wood': 'W', 'Brick': 'B', 'Stone': 'S', 'Gold': 'G', 'Food': 'F'}[res] || res[0];
-                        return `<span class="cost-badge">${amt}${abbrev}</span>`;
-                    })
-                    .join('');
-                li.innerHTML = `
-                    <div>
-                        <div>🏛️ ${i + 1}. ${building.name}</div>
-                        <div style="margin-top: 5px;">${costStr}</div>
-                    </div>
-                    <span class="points-badge">${building.points} pts</span>
-                `;
-                buildList.appendChild(li);
-            });
-            buildCard.appendChild(buildList);
+            const buildCard = createZoneCard('Building');
+            built.zones['Building'] = buildCard.querySelector('.worker-count');
+            built.buildList = document.createElement('ul');
+            built.buildList.className = 'building-list';
+            built.buildKey = null;
+            buildCard.appendChild(built.buildList);
             buildings.appendChild(buildCard);
             
-            // Render players
+            // Players
             const playersDiv = document.getElementById('players');
             playersDiv.innerHTML = '';
             data.players.forEach(player => {
-                playersDiv.appendChild(createPlayerCard(player));
+                const card = createPlayerCard(player);
+                const stats = card.querySelectorAll('.stat-value');
+                const amounts = card.querySelectorAll('.resource-amount');
+                built.players.push({
+                    score: card.querySelector('.player-score'),
+                    workers: stats[0],
+                    food: stats[1],
+                    tools: stats[2],
+                    resources: {
+                        wood: amounts[0], brick: amounts[1], stone: amounts[2],
+                        gold: amounts[3], food: amounts[4]
+                    },
+                    owned: card.querySelector('.owned-slot'),
+                    ownedKey: null
+                });
+                playersDiv.appendChild(card);
+            });
+            
+            return built;
+        }
+        
+        function setText(node, text) {
+            // Only touch the DOM when the text actually changed
+            if (node.textContent !== text) {
+                node.textContent = text;
+            }
+        }
+        
+        function updateZone(zone, workers, maxWorkers) {
+            const count = refs.zones[zone];
+            setText(count, `${workers}/${maxWorkers}`);
+            count.classList.toggle('empty', workers === 0);
+        }
+        
+        function updateGameBoard(data) {
+            const board = data.board;
+            setText(refs.round, `Round ${data.current_round} of ${data.max_rounds}`);
+            
+            resourceZoneNames.forEach(zone => {
+                updateZone(zone, board.placed_workers[zone] || 0, board.action_spaces[zone] || 7);
+            });
+            specialZoneNames.forEach(zone => {
+                updateZone(zone, board.placed_workers[zone] || 0, board.action_spaces[zone] || 1);
+            });
+            updateZone('Civilization Card', board.placed_workers['Civilization Card'] || 0, 1);
+            updateZone('Building', board.placed_workers['Building'] || 0, 1);
+            
+            // The face-up rows are only rebuilt when a card or building was taken
+            const cardKey = board.civilization_cards.map(card => card.name).join('|');
+            if (cardKey !== refs.cardKey) {
+                refs.cardKey = cardKey;
+                refs.cardList.innerHTML = board.civilization_cards.map((card, i) => `
+                    <li class="card-item">
+                        <span>📜 ${i + 1}. ${card.name}</span>
+                        <span class="points-badge">${card.points} pts</span>
+                    </li>`).join('');
+            }
+            
+            const buildKey = board.buildings.map(building => building.name).join('|');
+            if (buildKey !== refs.buildKey) {
+                refs.buildKey = buildKey;
+                refs.buildList.innerHTML = board.buildings.map((building, i) => {
+                    return `
+                    <li class="building-item">
+                        <div>
+                            <div>🏛️ ${i + 1}. ${building.name}</div>
+                            <div style="margin-top: 5px;">${costHTML(building)}</div>
+                        </div>
+                        <span class="points-badge">${building.points} pts</span>
+                    </li>`;
+                }).join('');
+            }
+            
+            data.players.forEach((player, i) => {
+                const ref = refs.players[i];
+                const res = player.resources;
+                setText(ref.score, `${player.score} pts`);
+                setText(ref.workers, `👷 ${player.workers}`);
+                setText(ref.food, `🌾 ${player.food_track}`);
+                setText(ref.tools, `🔨 [${player.tools.length > 0 ? player.tools.join(', ') : 'None'}]`);
+                setText(ref.resources.wood, String(res.wood));
+                setText(ref.resources.brick, String(res.brick));
+                setText(ref.resources.stone, String(res.stone));
+                setText(ref.resources.gold, String(res.gold));
+                setText(ref.resources.food, String(res.food));
+                
+                // Owned cards and buildings only ever grow, so their lengths are a cheap change key
+                const ownedKey = player.civilization_cards.length + '/' + player.buildings.length;
+                if (ownedKey !== ref.ownedKey) {
+                    ref.ownedKey = ownedKey;
+                    ref.owned.innerHTML = renderOwnedItems(player);
+                }
             });
         }
         
-        function createZoneCard(zoneName, workers, maxWorkers) {
+        const resourceAbbrevs = {'Wood': 'W', 'Brick': 'B', 'Stone': 'S', 'Gold': 'G', 'Food': 'F'};
+        
+        // Building costs never change, so each building's badges are built once
+        const _costCache = new Map();
+        
+        function costHTML(building) {
+            let html = _costCache.get(building.name);
+            if (html === undefined) {
+                html = Object.entries(building.cost)
+                    .map(([res, amt]) => `<span class="cost-badge">${amt}${resourceAbbrevs[res] || res[0]}</span>`)
+                    .join('');
+                _costCache.set(building.name, html);
+            }
+            return html;
+        }
+        
+        function createZoneCard(zoneName) {
             const card = document.createElement('div');
             card.className = 'zone-card';
             
             const zoneInfo = actionZones[zoneName] || { icon: '📋' };
-            const workerClass = workers > 0 ? '' : 'empty';
             
             card.innerHTML = `
                 <div class="zone-header">
                     <span class="zone-icon">${zoneInfo.icon}</span>
                     <span class="zone-title">${zoneName}</span>
-                    <span class="worker-count ${workerClass}">${workers}/${maxWorkers}</span>
+                    <span class="worker-count empty"></span>
                 </div>
             `;
             
@@ -585,56 +651,55 @@ class WebVisualizer:
         }
         
         function createPlayerCard(player) {
+            // Skeleton only; updateGameBoard fills in the values
             const card = document.createElement('div');
             card.className = 'player-card';
             
-            const toolsStr = player.tools.length > 0 ? player.tools.join(', ') : 'None';
-            
             card.innerHTML = `
                 <div class="player-header">
                     <div class="player-name">${player.name}</div>
-                    <div class="player-score">${player.score} pts</div>
+                    <div class="player-score"></div>
                 </div>
                 
                 <div class="player-stats">
                     <div class="stat-item">
                         <div class="stat-label">Workers</div>
-                        <div class="stat-value">👷 ${player.workers}</div>
+                        <div class="stat-value"></div>
                     </div>
                     <div class="stat-item">
                         <div class="stat-label">Food/Turn</div>
-                        <div class="stat-value">🌾 ${player.food_track}</div>
+                        <div class="stat-value"></div>
                     </div>
                     <div class="stat-item">
                         <div class="stat-label">Tools</div>
-                        <div class="stat-value">🔨 [${toolsStr}]</div>
+                        <div class="stat-value"></div>
                     </div>
                 </div>
                 
                 <div class="resources-grid">
                     <div class="resource-item">
                         <div class="resource-icon">🌲</div>
-                        <div class="resource-amount">${player.resources.wood}</div>
+                        <div class="resource-amount"></div>
                     </div>
                     <div class="resource-item">
                         <div class="resource-icon">🧱</div>
-                        <div class="resource-amount">${player.resources.brick}</div>
+                        <div class="resource-amount"></div>
                     </div>
                     <div class="resource-item">
                         <div class="resource-icon">🪨</div>
-                        <div class="resource-amount">${player.resources.stone}</div>
+                        <div class="resource-amount"></div>
                     </div>
                     <div class="resource-item">
                         <div class="resource-icon">💰</div>
-                        <div class="resource-amount">${player.resources.gold}</div>
+                        <div class="resource-amount"></div>
                     </div>
                     <div class="resource-item">
                         <div class="resource-icon">🍖</div>
-                        <div class="resource-amount">${player.resources.food}</div>
+                        <div class="resource-amount"></div>
                     </div>
                 </div>
                 
-                ${renderOwnedItems(player)}
+                <div class="owned-slot"></div>
             `;
             
             return card;
@@ -671,44 +736,309 @@ class WebVisualizer:
             return html;
         }
         
-        // Load initial state
-        loadGameState();
-        
-        // Auto-refresh every 3 seconds
-        setInterval(loadGameState, 3000);
+        // The server pushes the current state on connect and then every change;
+        // browsers without EventSource poll every 3 seconds instead
+        if (window.EventSource) {
+            const events = new EventSource('events');
+            events.onmessage = (event) => renderGameBoard(JSON.parse(event.data));
+            // A refused stream (e.g. 503 when the server is full) is not retried; poll instead
+            events.onerror = () => {
+                if (events.readyState === EventSource.CLOSED) {
+                    loadGameState();
+                    setInterval(loadGameState, 3000);
+                }
+            };
+        } else {
+            loadGameState();
+            setInterval(loadGameState, 3000);
+        }
     </script>
 </body>
-</html>'''
+</html>'''.encode('utf-8')
+
+
+class _PooledHTTPServer(http.server.ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that hands connections to a fixed pool of daemon threads.
+    A worker that starts a long-lived stream (see begin_stream) is replaced in the pool,
+    so short requests never wait behind open streams.
+    """
+    
+    def __init__(self, server_address, handler_class, workers: int = SERVER_WORKERS,
+                 max_streams: int = SSE_MAX_STREAMS):
+        super().__init__(server_address, handler_class)
+        self._requests = queue.SimpleQueue()
+        self._pool_size = workers
+        self._streams = threading.BoundedSemaphore(max_streams)
+        self._worker_state = threading.local()  # .streaming is set on a worker serving a stream
+        for _ in range(workers):
+            self._start_worker()
+    
+    def _start_worker(self):
+        # Daemon threads, so open connections don't keep the process alive
+        threading.Thread(target=self._serve_queued, daemon=True).start()
+    
+    def process_request(self, request, client_address):
+        """Queue the connection for the next free worker instead of starting a thread"""
+        self._requests.put((request, client_address))
+    
+    def begin_stream(self) -> bool:
+        """
+        Called by a handler about to hold its connection open. Starts a replacement worker
+        and retires the calling thread once its request is done. Returns False when
+        max_streams streams are already open.
+        """
+        if not self._streams.acquire(blocking=False):
+            return False
+        self._worker_state.streaming = True
+        self._start_worker()
+        return True
+    
+    def _serve_queued(self):
+        while True:
+            queued = self._requests.get()
+            if queued is None:
+                return
+            self.process_request_thread(*queued)
+            if getattr(self._worker_state, 'streaming', False):
+                # A replacement took this thread's place in the pool
+                self._streams.release()
+                return
+    
+    def server_close(self):
+        super().server_close()
+        for _ in range(self._pool_size):
+            self._requests.put(None)
+
+
+class WebVisualizer:
+    """Handles web-based visualization of the Stone Age game board"""
+    
+    def __init__(self, game_state: GameState, port: int = 8080):
+        self.game_state = game_state
+        self.port = port
+        self.server = None
+        self.server_thread = None
+        self.latest_state = None
+        self.state_payload = None  # Serialized state served at /game_state.json
+        self.state_payload_gz = None  # state_payload gzip-compressed, for clients that accept it
+        self._event_frame = None  # state_payload framed as one Server-Sent Event, shared by all streams
+        self.etag = None  # ETag of state_payload (hash of its contents)
+        self._published = threading.Condition()  # Notified when a new payload is published
+        self._stopping = False  # Set by stop_server() to end open event streams
+        self._player_cache = {}  # Player index -> (signature, exported dict)
+        self._board_cache = None  # (signature, exported face-up cards, exported face-up buildings)
         
+    def export_game_state(self) -> dict:
+        """Export game state as a dictionary of plain JSON values (no custom encoder needed)"""
+        state = {
+            'current_round': self.game_state.current_round,
+            'max_rounds': self.game_state.max_rounds,
+            'players': [],
+            'board': {
+                'civilization_cards': [],
+                'buildings': [],
+                'action_spaces': {},
+                'placed_workers': {}
+            }
+        }
+        
+        # Export players
+        state['players'] = [self._export_player(i, player)
+                            for i, player in enumerate(self.game_state.players)]
+        
+        # Export board (face-up slots only change when a card is drawn or a building taken)
+        board = self.game_state.board
+        signature = (len(board.civilization_cards), board.buildings_version)
+        cached = self._board_cache
+        if cached is None or cached[0] != signature:
+            cached = self._board_cache = (signature,
+                                          _export_cards(board.face_up_cards),
+                                          _export_buildings(board.face_up_buildings))
+        state['board']['civilization_cards'] = cached[1]
+        state['board']['buildings'] = cached[2]
+        
+        # Export action spaces and worker placements
+        action_spaces = board.action_spaces
+        placed = board.placed_worker_counts
+        state['board']['action_spaces'] = {action.value: limit for action, limit in action_spaces.items()}
+        state['board']['placed_workers'] = {action.value: placed[action] for action in action_spaces}
+        
+        return state
+    
+    def _export_player(self, index: int, player: Player) -> dict:
+        """
+        Export one player, reusing the previous export while the player is unchanged.
+        Cards and buildings are only ever added, so their counts stand in for the lists.
+        """
+        resources = player.resources.as_tuple()
+        signature = (player.name, player.workers, player.food_track, bytes(player.tools),
+                     player.score, resources, len(player.civilization_cards), len(player.buildings))
+        cached = self._player_cache.get(index)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        
+        exported = {
+            'name': player.name,
+            'workers': player.workers,
+            'food_track': player.food_track,
+            'tools': player.owned_tools(),
+            'score': player.score,
+            'resources': dict(zip(_RES_KEYS, resources)),
+            'civilization_cards': _export_cards(player.civilization_cards),
+            'buildings': _export_buildings(player.buildings)
+        }
+        self._player_cache[index] = (signature, exported)
+        return exported
+    
+    def save_state_to_file(self) -> bytes:
+        """
+        Publish the current game state for the web interface.
+        The JSON is kept in memory and served from there by the HTTP server, so nothing
+        is written to disk. The published payload is kept if the new one is byte-for-byte
+        the same, so saving an unchanged state costs only the export and a hash.
+        """
+        state = self.export_game_state()
+        self.latest_state = state
+        
+        payload = dumps_state(state)
+        etag = '"' + hashlib.blake2b(payload, digest_size=16).hexdigest() + '"'
+        if etag != self.etag:
+            payload_gz = gzip.compress(payload, compresslevel=STATE_GZIP_LEVEL)
+            # Every line of a multi-line event needs its own "data:" prefix
+            event_frame = b'data: ' + payload.replace(b'\n', b'\ndata: ') + b'\n\n'
+            with self._published:
+                self.state_payload = payload
+                self.state_payload_gz = payload_gz
+                self._event_frame = event_frame
+                self.etag = etag
+                self._published.notify_all()
+        
+        return self.state_payload
+    
+    def published_state(self) -> Tuple[Optional[str], Optional[bytes], Optional[bytes]]:
+        """Get a consistent (etag, payload, gzipped payload) snapshot of the published state"""
+        with self._published:
+            return self.etag, self.state_payload, self.state_payload_gz
+    
+    def wait_for_state(self, etag: Optional[str],
+                       timeout: Optional[float] = None) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Block until a state other than the one with this ETag is published, the
+        timeout expires or the server stops. Returns the current (etag, event frame):
+        all streams share the frame built once per publish, and a slow client
+        skips straight to the newest state instead of queueing old ones.
+        """
+        with self._published:
+            self._published.wait_for(lambda: self.etag != etag or self._stopping, timeout)
+            return self.etag, self._event_frame
+    
+    def create_html_file(self):
+        """Create the HTML file for the web visualization"""
+        web_dir = Path(__file__).parent / 'web'
+        web_dir.mkdir(exist_ok=True)
         html_file = web_dir / 'index.html'
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        if html_file.exists() and html_file.read_bytes() == _INDEX_HTML:
+            return html_file
+        html_file.write_bytes(_INDEX_HTML)
         
         return html_file
     
     def start_server(self):
         """Start the web server in a background thread"""
         web_dir = Path(__file__).parent / 'web'
+        visualizer = self
+        
+        # Resolved once; only the requested path needs resolving per request
+        real_web_dir = str(web_dir.resolve())
+        web_dir_prefix = real_web_dir + os.sep
+        index_path = os.path.join(real_web_dir, 'index.html')
         
         class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             def __init__(self, *args, **kwargs):
                 super().__init__(*args, directory=str(web_dir), **kwargs)
             
+            def _is_state_request(self):
+                return self.path.split('?', 1)[0].endswith('/game_state.json')
+            
+            def do_GET(self):
+                """Serve the game state from memory; other files come from web_dir"""
+                if self.path.split('?', 1)[0] == '/events':
+                    if not self.server.begin_stream():
+                        self.send_error(503, "Too many open event streams")
+                        return
+                    self._stream_events()
+                    return
+                if not self._is_state_request():
+                    super().do_GET()
+                    return
+                
+                etag, payload, payload_gz = visualizer.published_state()
+                if payload is None:
+                    self.send_error(404, "Game state not published yet")
+                    return
+                
+                # The gzipped body is a different representation, so it gets its own ETag
+                use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+                if use_gzip:
+                    payload = payload_gz
+                    etag = etag[:-1] + '-gz"'
+                
+                # Answer polls with 304 Not Modified while the state is unchanged
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                if use_gzip:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def _stream_events(self):
+                """Push every newly published state to the client as a Server-Sent Event"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                self.close_connection = True
+                
+                sent = None
+                try:
+                    while not visualizer._stopping:
+                        etag, frame = visualizer.wait_for_state(sent, SSE_KEEPALIVE_SECONDS)
+                        if frame is not None and etag != sent:
+                            self.wfile.write(frame)
+                            sent = etag
+                        else:
+                            self.wfile.write(b': keepalive\n\n')
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client went away
+            
             def translate_path(self, path):
                 """Restrict access to web directory only"""
                 path = super().translate_path(path)
                 # Ensure path is within web_dir
-                real_path = Path(path).resolve()
-                real_web_dir = Path(web_dir).resolve()
-                if not str(real_path).startswith(str(real_web_dir)):
-                    return str(real_web_dir / 'index.html')
+                real_path = os.path.realpath(path)
+                if real_path != real_web_dir and not real_path.startswith(web_dir_prefix):
+                    return index_path
                 return path
             
             def log_message(self, format, *args):
                 # Suppress server logs
                 pass
         
-        self.server = socketserver.TCPServer(("127.0.0.1", self.port), MyHTTPRequestHandler)
+        # A bounded worker pool, so a slow client cannot hold up other viewers' polls
+        # and a burst of requests cannot start an unbounded number of threads
+        self.server = _PooledHTTPServer(("127.0.0.1", self.port), MyHTTPRequestHandler)
         self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
         self.server_thread.start()
         
@@ -718,6 +1048,9 @@ class WebVisualizer:
     
     def stop_server(self):
         """Stop the web server"""
+        with self._published:
+            self._stopping = True
+            self._published.notify_all()
         if self.server:
             self.server.shutdown()
             self.server.server_close()